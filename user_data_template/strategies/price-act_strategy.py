@@ -1,6 +1,8 @@
 # 升级版裸K线策略 - 分层结构：基础工具方法 + 组合策略
 
 from freqtrade.strategy import IStrategy, DecimalParameter, CategoricalParameter
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import pandas as pd
 from datetime import datetime
 from typing import Optional, Union, Dict
@@ -98,48 +100,40 @@ class PriceActionStrategy(IStrategy):
         if len(dataframe) < trend_period_value:
             return result
 
-        for i in range(trend_period_value, len(dataframe)):
-            # 获取分析周期内的数据
-            start_idx = i - trend_period_value
-            period_data = dataframe.iloc[start_idx:i]
-            
-            # 当前K线数据
-            current_candle = dataframe.iloc[i]
-
-            # 条件1：最小实体k线在后半段
-            # 找到分析周期内最小实体K线的位置
-            min_body_idx = period_data['body_length'].idxmin()
-            period_start_idx = period_data.index[0]
-            
-            # 计算最小实体K线在周期内的相对位置（0到1之间）
-            min_body_position_ratio = (min_body_idx - period_start_idx) / (len(period_data) - 1) if len(period_data) > 1 else 0
-            
-            # 最小实体k线在后半段条件 - 使用可优化参数
-            min_body_condition = bool(min_body_position_ratio >= min_body_threshold)
-            
-            # 条件2：最新一条k线升穿MA
-            # 检查当前K线收盘价是否突破MA
-            current_close = current_candle['close']
-            ma_column = f'ma{ma_period_value}'
-            current_ma = current_candle[ma_column]
-            prev_close = dataframe.iloc[i-1]['close'] if i > 0 else 0
-            prev_ma = dataframe.iloc[i-1][ma_column] if i > 0 else 0
-            
-            # 升穿条件：当前收盘价高于MA，且前一根K线收盘价低于或等于MA
-            ma_breakout_condition = bool(
-                current_close > current_ma and 
-                prev_close <= prev_ma and
-                not pd.isna(current_ma) and 
-                not pd.isna(prev_ma)
-            )
-
-            # 组合条件：最小实体k线在后半段 + 升穿ma20
-            condition = min_body_condition and ma_breakout_condition
-
-            if condition:
-                result.iloc[i] = True
-
-        return result
+        # 一次性取出列数据为ndarray，避免逐行iloc构造Series
+        body_length = dataframe['body_length'].to_numpy(dtype=float)
+        # idxmin会跳过NaN，用inf填充以保持一致
+        body_length = np.where(np.isnan(body_length), np.inf, body_length)
+        close = dataframe['close'].to_numpy(dtype=float)
+        ma = dataframe[f'ma{ma_period_value}'].to_numpy(dtype=float)
+        signal = np.zeros(len(dataframe), dtype=bool)
+
+        # 条件2：最新一条k线升穿MA（整列预先计算）
+        # 升穿条件：当前收盘价高于MA，且前一根K线收盘价低于或等于MA；MA为NaN时比较结果均为False
+        ma_breakout = np.zeros(len(dataframe), dtype=bool)
+        ma_breakout[1:] = (close[1:] > ma[1:]) & (close[:-1] <= ma[:-1])
+
+        # 只对升穿MA的K线检查条件1，其余K线直接跳过
+        candidates = np.flatnonzero(ma_breakout[trend_period_value:]) + trend_period_value
+        if len(candidates) == 0:
+            return result
+
+        # 条件1：最小实体k线在后半段
+        # windows[k] 为 body_length[k:k + trend_period_value]，K线i的分析周期 [i - trend_period_value, i) 即 windows[i - trend_period_value]
+        windows = sliding_window_view(body_length, trend_period_value)
+        # argmin返回首个最小值的位置，与idxmin一致
+        min_body_pos = windows[candidates - trend_period_value].argmin(axis=1)
+
+        # 计算最小实体K线在周期内的相对位置（0到1之间）
+        if trend_period_value > 1:
+            min_body_position_ratio = min_body_pos / (trend_period_value - 1)
+        else:
+            min_body_position_ratio = np.zeros(len(candidates))
+
+        # 组合条件：最小实体k线在后半段 + 升穿ma20
+        signal[candidates] = min_body_position_ratio >= min_body_threshold
+
+        return pd.Series(signal, index=dataframe.index)
 
     # ======================= FreqTrade接口实现 =======================
 